@@ -1,38 +1,75 @@
 from datetime import date
-from typing import Optional
+from typing import Collection, Iterable, Optional
 
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, exists, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, load_only, noload, raiseload, selectinload
 
-from .models import Book, Member, Loan
+from .models import LOAN_PERIOD, Book, Member, Loan, books_fts
 from .schemas import BookCreate, MemberCreate
 
 
+def _insert_ignoring_conflicts(db: Session, model, *index_elements: str):
+    """Build an INSERT that skips rows conflicting on the given unique columns.
+
+    Uses ON CONFLICT DO NOTHING on PostgreSQL and SQLite; other backends get a
+    plain INSERT and report duplicates with an IntegrityError.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing(index_elements=list(index_elements))
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing(index_elements=list(index_elements))
+    return insert(model)
+
+
 # ── Books ──────────────────────────────────────────────────────────────────────
 
 def get_books(
         db: Session,
+        skip: int = 0,
+        limit: int = 100,
         title: Optional[str] = None,
         author: Optional[str] = None,
         genre: Optional[str] = None,
         available_only: bool = False,
 ) -> list[type[Book]]:
-    """Retrieve books from the database with optional filtering."""
+    """Retrieve books from the database with pagination and optional filtering.
+
+    Text filters match word prefixes through the FTS5 index on SQLite and
+    case-insensitive substrings on other databases.
+    """
     query = db.query(Book)
-    if title:
-        query = query.filter(Book.title.ilike(f"%{title}%"))
-    if author:
-        query = query.filter(Book.author.ilike(f"%{author}%"))
-    if genre:
-        query = query.filter(Book.genre.ilike(f"%{genre}%"))
+    if db.get_bind().dialect.name == "sqlite":
+        # Use the FTS5 index instead of leading-wildcard LIKE scans
+        match = _books_fts_match(title=title, author=author, genre=genre)
+        if match:
+            query = query.join(books_fts, books_fts.c.rowid == Book.id).filter(books_fts.c.books_fts.op("MATCH")(match))
+    else:
+        if title:
+            query = query.filter(Book.title.ilike(f"%{title}%"))
+        if author:
+            query = query.filter(Book.author.ilike(f"%{author}%"))
+        if genre:
+            query = query.filter(Book.genre.ilike(f"%{genre}%"))
     if available_only:
         query = query.filter(Book.available_copies > 0)
-    return query.all()
+    return query.order_by(Book.id).offset(skip).limit(limit).all()
+
+
+def _books_fts_match(**terms: Optional[str]) -> str:
+    """Build an FTS5 MATCH expression requiring every word of each term as a prefix in its column."""
+    clauses = []
+    for column_name, term in terms.items():
+        for word in (term or "").split():
+            quoted = word.replace('"', '""')
+            clauses.append(f'{column_name} : "{quoted}"*')
+    return " AND ".join(clauses)
 
 
 def get_book(db: Session, book_id: int) -> Book | None:
-    """Retrieve a single book by its ID."""
-    return db.query(Book).filter(Book.id == book_id).first()
+    """Retrieve a single book by its ID, served from the session's identity map when already loaded."""
+    return db.get(Book, book_id)
 
 
 def get_book_by_isbn(db: Session, isbn: str) -> Book | None:
@@ -41,20 +78,39 @@ def get_book_by_isbn(db: Session, isbn: str) -> Book | None:
 
 
 def create_book(db: Session, book: BookCreate) -> Book:
-    """Create a new book record in the database."""
-    new_book = Book(**book.model_dump(), available_copies=book.total_copies)
-    db.add(new_book)
+    """Create a new book record in a single INSERT ... RETURNING."""
+    new_book = db.scalar(
+        insert(Book)
+        .values(**book.model_dump(), available_copies=book.total_copies)
+        .returning(Book)
+    )
     db.commit()
-    db.refresh(new_book)
     return new_book
 
 
-def update_book(db: Session, book: Book, update_data: dict) -> Book:
-    """Update an existing book's attributes with the provided dictionary of changes."""
-    for key, value in update_data.items():
-        setattr(book, key, value)
+def create_books_bulk(db: Session, books: Iterable[BookCreate]) -> None:
+    """Insert many books in a single executemany statement, skipping duplicate ISBNs."""
+    rows = [book.model_dump() | {"available_copies": book.total_copies} for book in books]
+    if not rows:
+        return
+    db.execute(_insert_ignoring_conflicts(db, Book, "isbn"), rows)
+    db.commit()
+
+
+def update_book(db: Session, book_id: int, update_data: dict) -> Book | None:
+    """Update an existing book with the provided dictionary of changes.
+
+    Issues a single UPDATE ... RETURNING; returns None if the book does not exist.
+    """
+    if not update_data:
+        return get_book(db, book_id)
+    book = db.scalar(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(**update_data)
+        .returning(Book)
+    )
     db.commit()
-    db.refresh(book)
     return book
 
 
@@ -64,12 +120,12 @@ def delete_book(db: Session, book: Book) -> None:
     db.commit()
 
 
-def count_active_loans_for_book(db: Session, book_id: int) -> int:
-    """Count the number of currently active loans for a specific book."""
-    return db.query(Loan).filter(
+def has_active_loan_for_book(db: Session, book_id: int) -> bool:
+    """Check whether a specific book has at least one currently active loan."""
+    return db.query(exists().where(
         Loan.book_id == book_id,
         Loan.returned_date.is_(None)
-    ).count()
+    )).scalar()
 
 
 # ── Members ────────────────────────────────────────────────────────────────────
@@ -81,9 +137,17 @@ def get_members(
         name: Optional[str] = None,
         email: Optional[str] = None,
         is_active: Optional[bool] = None,
+        expand: Collection[str] = (),
 ) -> list[Member]:
-    """Retrieve library members from the database with pagination and optional filtering."""
-    query = db.query(Member)
+    """Retrieve library members from the database with pagination and optional filtering.
+
+    Only the scalar columns are loaded; pass expand={"loans"} to batch-load the
+    loans of the whole page with one extra SELECT ... IN query.
+    """
+    options = [load_only(Member.id, Member.name, Member.email, Member.joined_date, Member.is_active)]
+    if "loans" in expand:
+        options.append(selectinload(Member.loans))
+    query = db.query(Member).options(*options, raiseload("*"))
     if name:
         query = query.filter(Member.name.ilike(f"%{name}%"))
     if email:
@@ -94,8 +158,20 @@ def get_members(
 
 
 def get_member(db: Session, member_id: int) -> Member | None:
-    """Retrieve a single member by their ID."""
-    return db.query(Member).filter(Member.id == member_id).first()
+    """Retrieve a single member by their ID, served from the session's identity map when already loaded."""
+    return db.get(Member, member_id)
+
+
+def get_member_with_loans(db: Session, member_id: int) -> Member | None:
+    """Retrieve a single member by their ID together with their full loan history.
+
+    Loans are fetched with one extra SELECT ... IN query; any other relationship
+    access raises instead of silently issuing lazy loads.
+    """
+    return db.query(Member).options(
+        selectinload(Member.loans),
+        raiseload("*"),
+    ).filter(Member.id == member_id).first()
 
 
 def get_member_by_email(db: Session, email: str) -> Member | None:
@@ -103,21 +179,38 @@ def get_member_by_email(db: Session, email: str) -> Member | None:
     return db.query(Member).filter(Member.email == email).first()
 
 
-def create_member(db: Session, member: MemberCreate) -> Member:
-    """Create a new member record in the database."""
-    new_member = Member(**member.model_dump())
-    db.add(new_member)
+def create_member(db: Session, member: MemberCreate) -> Member | None:
+    """Create a new member record in a single INSERT ... RETURNING.
+
+    Returns None if a member with the same email already exists.
+    """
+    new_member = db.scalar(
+        _insert_ignoring_conflicts(db, Member, "email")
+        .values(**member.model_dump())
+        .returning(Member)
+        # A new member cannot have loans yet
+        .options(noload(Member.loans))
+    )
     db.commit()
-    db.refresh(new_member)
     return new_member
 
 
-def update_member(db: Session, member: Member, update_data: dict) -> Member:
-    """Update an existing member's attributes with the provided dictionary of changes."""
-    for field, value in update_data.items():
-        setattr(member, field, value)
+def update_member(db: Session, member_id: int, update_data: dict) -> Member | None:
+    """Update an existing member with the provided dictionary of changes.
+
+    Issues an UPDATE ... RETURNING plus one SELECT ... IN for the member's loans;
+    returns None if the member does not exist.
+    """
+    if not update_data:
+        return get_member_with_loans(db, member_id)
+    member = db.scalar(
+        update(Member)
+        .where(Member.id == member_id)
+        .values(**update_data)
+        .returning(Member)
+        .options(selectinload(Member.loans), raiseload("*"))
+    )
     db.commit()
-    db.refresh(member)
     return member
 
 
@@ -127,9 +220,12 @@ def delete_member(db: Session, member: Member) -> None:
     db.commit()
 
 
-def get_member_loans(db: Session, member_id: int) -> list[type[Loan]]:
-    """Retrieve all loans associated with a specific member."""
-    return db.query(Loan).filter(Loan.member_id == member_id).all()
+def has_active_loan_for_member(db: Session, member_id: int) -> bool:
+    """Check whether a member has at least one currently active loan."""
+    return db.query(exists().where(
+        Loan.member_id == member_id,
+        Loan.returned_date.is_(None)
+    )).scalar()
 
 
 def count_active_loans_for_member(db: Session, member_id: int) -> int:
@@ -140,43 +236,84 @@ def count_active_loans_for_member(db: Session, member_id: int) -> int:
     ).scalar()
 
 
-def calculate_member_fines(loans: list[Loan]) -> float:
+def calculate_member_fines(db: Session, member_id: int, today: Optional[date] = None) -> float:
     """Calculate total outstanding fines for a member.
 
     Considers:
     - $0.50/day overdue for active loans (not yet returned).
     - Recorded fine_amount on returned loans.
     """
-    return calculate_detailed_member_fines(loans)["total_fines"]
+    return calculate_detailed_member_fines(db, member_id, today)["total_fines"]
+
+
+def calculate_loan_fines(loans: Iterable[Loan], today: Optional[date] = None) -> float:
+    """Calculate total fines from already-loaded loans, using the same rules as
+    calculate_detailed_member_fines but without another query.
+    """
+    today = today or date.today()
+    return round(sum(loan.fine_as_of(today) for loan in loans), 2)
+
+
+def _total_fine_column(today: Optional[date]):
+    """Aggregate column summing every loan's fine as of today."""
+    return func.coalesce(func.sum(Loan.fine_as_of(today or date.today())), 0)
+
 
+def _fine_columns(today: Optional[date]):
+    """Aggregate columns for total fines, overdue count and returned-loan fines."""
+    today = today or date.today()
+    is_overdue = and_(Loan.returned_date.is_(None), Loan.due_date < today)
+    return (
+        _total_fine_column(today),
+        func.coalesce(func.sum(case((is_overdue, 1), else_=0)), 0),
+        func.coalesce(func.sum(case(
+            (Loan.returned_date.isnot(None), func.coalesce(Loan.fine_amount, 0)),
+            else_=0,
+        )), 0),
+    )
 
-def calculate_detailed_member_fines(loans: list[Loan]) -> dict:
+
+def calculate_detailed_member_fines(db: Session, member_id: int, today: Optional[date] = None) -> dict:
     """Calculate total outstanding fines: $0.50/day overdue for active loans
     plus any recorded fine_amount on returned loans.
 
-    Returns a dictionary with details for reporting.
+    The sums are computed by a single aggregate query, so no loan rows are
+    loaded into Python. Returns a dictionary with details for reporting.
     """
-    total_fines = 0.0
-    active_overdue_loans = 0
-    unpaid_returned_fines = 0.0
-    today = date.today()
-
-    for loan in loans:
-        if loan.returned_date is None and loan.due_date < today:
-            overdue_days = (today - loan.due_date).days
-            total_fines += overdue_days * 0.50
-            active_overdue_loans += 1
-        elif loan.returned_date and loan.fine_amount:
-            total_fines += loan.fine_amount
-            unpaid_returned_fines += loan.fine_amount
+    total_fines, active_overdue_loans, unpaid_returned_fines = db.query(
+        *_fine_columns(today)
+    ).filter(Loan.member_id == member_id).one()
 
     return {
-        "total_fines": round(total_fines, 2),
+        "total_fines": round(float(total_fines), 2),
         "active_overdue_loans": active_overdue_loans,
-        "unpaid_returned_fines": round(unpaid_returned_fines, 2)
+        "unpaid_returned_fines": round(float(unpaid_returned_fines), 2)
     }
 
 
+def summarize_member_loans(db: Session, member_id: int, today: Optional[date] = None) -> tuple[int, float]:
+    """Count a member's active loans and total their fines in one aggregate query.
+
+    Returns an (active_loans_count, total_fines) tuple.
+    """
+    active_loans_count, total_fines = db.query(
+        func.coalesce(func.sum(case((Loan.returned_date.is_(None), 1), else_=0)), 0),
+        _total_fine_column(today),
+    ).filter(Loan.member_id == member_id).one()
+    return active_loans_count, round(float(total_fines), 2)
+
+
+def calculate_all_member_fines(db: Session, today: Optional[date] = None) -> dict[int, float]:
+    """Calculate total fines for every member with loans in one grouped query.
+
+    Intended for batch reporting; members without loans are omitted.
+    """
+    rows = db.query(
+        Loan.member_id, _total_fine_column(today)
+    ).group_by(Loan.member_id).all()
+    return {member_id: round(float(total), 2) for member_id, total in rows}
+
+
 # ── Loans ──────────────────────────────────────────────────────────────────────
 
 def get_active_loan(db: Session, member_id: int, book_id: int) -> Loan | None:
@@ -200,22 +337,70 @@ def get_active_loans_for_member(db: Session, member_id: int) -> list[Loan]:
     ).all()
 
 
-def create_loan(db: Session, book: Book, member_id: int) -> Loan:
-    """Create a loan record and decrement the book's available copies atomically."""
-    book.available_copies -= 1
-    new_loan = Loan(book_id=book.id, member_id=member_id)
-    db.add(new_loan)
+def get_borrow_status(db: Session, member_id: int, book_id: int):
+    """Fetch everything needed to validate a borrow in a single query.
+
+    Returns a row with the member's is_active flag, the book's title and
+    available_copies (None if the book does not exist) and whether the member
+    already has an active loan for the book, or None if the member does not exist.
+    """
+    has_active_loan = exists().where(
+        Loan.member_id == member_id,
+        Loan.book_id == book_id,
+        Loan.returned_date.is_(None)
+    )
+    return db.query(
+        Member.is_active,
+        Book.title,
+        Book.available_copies,
+        has_active_loan.label("has_active_loan"),
+    ).select_from(Member).outerjoin(Book, Book.id == book_id).filter(Member.id == member_id).first()
+
+
+def create_loan(db: Session, book_id: int, member_id: int, today: Optional[date] = None) -> Loan | None:
+    """Reserve a copy of the book and create a loan record atomically.
+
+    The available copies are decremented with a conditional UPDATE, so two
+    concurrent borrows can never oversell a book. Returns None (and creates no
+    loan) when the book does not exist or has no available copies.
+    """
+    reserved = db.execute(
+        update(Book)
+        .where(Book.id == book_id, Book.available_copies > 0)
+        .values(available_copies=Book.available_copies - 1)
+    )
+    if reserved.rowcount == 0:
+        return None
+    today = today or date.today()
+    new_loan = db.scalar(
+        insert(Loan)
+        .values(book_id=book_id, member_id=member_id, borrowed_date=today, due_date=today + LOAN_PERIOD)
+        .returning(Loan)
+    )
     db.commit()
-    db.refresh(new_loan)
     return new_loan
 
 
-def close_loan(db: Session, loan: Loan, book: Book) -> Loan:
-    """Mark a loan as returned, calculate any fine, and restore available copies."""
-    today = date.today()
-    loan.returned_date = today
-    loan.fine_amount = max(0.0, (today - loan.due_date).days * 0.50) if today > loan.due_date else 0.0
-    book.available_copies += 1
+def close_loan(db: Session, loan: Loan, today: Optional[date] = None) -> Loan | None:
+    """Mark a loan as returned, calculate any fine, and restore available copies.
+
+    Only a loan that is still active is closed, so a concurrent return of the same
+    loan cannot restore the copy twice. Returns None if the loan was already returned.
+    """
+    today = today or date.today()
+    fine_amount = loan.fine_as_of(today)
+    closed_loan = db.scalar(
+        update(Loan)
+        .where(Loan.id == loan.id, Loan.returned_date.is_(None))
+        .values(returned_date=today, fine_amount=fine_amount)
+        .returning(Loan)
+    )
+    if closed_loan is None:
+        return None
+    db.execute(
+        update(Book)
+        .where(Book.id == loan.book_id)
+        .values(available_copies=Book.available_copies + 1)
+    )
     db.commit()
-    db.refresh(loan)
-    return loan
+    return closed_loan
@@ -1,6 +1,7 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.orm import Load, Session, sessionmaker, DeclarativeBase, raiseload
+from sqlalchemy.pool import StaticPool
 
 """
 Database configuration and session management.
@@ -8,12 +9,73 @@ Database configuration and session management.
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./library.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+# Connection pool sizing; pool_size + max_overflow bounds the number of concurrent DB sessions
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "5"))
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Development mode: relationships that are not eagerly loaded raise instead of lazy loading
+DEV = os.getenv("DEV", "").lower() in ("1", "true", "yes")
+
+
+def _engine_options(url: str) -> dict:
+    """
+    Builds create_engine() keyword arguments suited to the database backend.
+    """
+    parsed_url = make_url(url)
+    if parsed_url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if parsed_url.database in (None, "", ":memory:"):
+            # An in-memory database only lives as long as its single connection
+            return {**options, "poolclass": StaticPool}
+    else:
+        # Network databases: drop dead connections on checkout and recycle before server-side timeouts
+        options = {"pool_pre_ping": True, "pool_recycle": 3600}
+    return {
+        **options,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL))
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Tunes every new SQLite connection: WAL lets readers run concurrently with a writer.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=30000000000")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
+# Keep loaded and RETURNING rows usable after commit instead of reloading them on next access
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def raise_on_lazy_load(orm_execute_state):
+    """
+    Adds raiseload("*") to every top-level ORM statement that loads rows, SELECTs and
+    INSERT/UPDATE ... RETURNING alike, so an N+1 lazy load fails loudly.
+    """
+    if orm_execute_state.is_relationship_load or orm_execute_state.is_column_load:
+        return
+    statement = orm_execute_state.statement
+    if orm_execute_state.is_select:
+        orm_execute_state.statement = statement.options(raiseload("*"))
+    elif orm_execute_state.is_insert or orm_execute_state.is_update:
+        # A bare wildcard needs a FROM entity; DML statements name their target explicitly
+        orm_execute_state.statement = statement.options(Load(orm_execute_state.bind_mapper).raiseload("*"))
+
+
+if DEV:
+    event.listen(Session, "do_orm_execute", raise_on_lazy_load)
 
 
 class Base(DeclarativeBase):
@@ -0,0 +1,12 @@
+"""
+Shared FastAPI dependencies for the LibraryMCP routers.
+"""
+from datetime import date
+
+
+async def get_today() -> date:
+    """
+    Returns the current date, resolved once per request so every fine and
+    due-date calculation in a handler agrees on the same day.
+    """
+    return date.today()
@@ -3,19 +3,36 @@ Main entry point for the LibraryMCP FastAPI application.
 Initializes the database, sets up middleware, and includes all routers.
 """
 
+import os
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from anyio import to_thread
 from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.auth import get_current_user
-from backend.database import engine, Base
+from backend.database import DB_MAX_OVERFLOW, DB_POOL_SIZE, engine, Base
 from backend.routers import books, members, loans
 from backend.routers import auth as auth_router
 
-app = FastAPI(title="LibraryMCP")
+# Route handlers are sync and run on AnyIO's worker thread pool, one thread per in-flight request.
+# By default it matches the DB connection pool capacity so no worker thread waits for a connection.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+    engine.dispose()
+
+
+app = FastAPI(title="LibraryMCP", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -5,11 +5,17 @@ This module defines the SQLAlchemy ORM models for Books, Members, and Loans.
 from datetime import date, timedelta
 from typing import Optional
 
-from sqlalchemy import Date, ForeignKey
+from sqlalchemy import Date, ForeignKey, Index, Integer, case, column, event, func, literal, table, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_method
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 from backend.database import Base
 
+LOAN_PERIOD = timedelta(days=14)
+FINE_PER_DAY = 0.50
+
 
 class Book(Base):
     """
@@ -25,6 +31,9 @@ class Book(Base):
     available_copies: Mapped[int]
     genre: Mapped[Optional[str]]
 
+    # Loan rows are left untouched when a book is deleted; never loaded implicitly
+    loans: Mapped[list["Loan"]] = relationship(back_populates="book", lazy="raise", passive_deletes="all")
+
 
 class Member(Base):
     """
@@ -46,13 +55,117 @@ class Loan(Base):
     Represents a book loan record.
     """
     __tablename__ = "loans"
+    __table_args__ = (
+        # Active-loan lookups filter on member/book together with returned_date IS NULL
+        Index("ix_loans_member_returned", "member_id", "returned_date"),
+        Index("ix_loans_book_returned", "book_id", "returned_date"),
+        # PostgreSQL: a partial index holding only open loans stays small as loan history grows
+        Index(
+            "ix_loans_member_open", "member_id",
+            postgresql_where=text("returned_date IS NULL"),
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     book_id: Mapped[int] = mapped_column(ForeignKey("books.id"))
     member_id: Mapped[int] = mapped_column(ForeignKey("members.id"))
     borrowed_date: Mapped[date] = mapped_column(Date, default=date.today)
-    due_date: Mapped[date] = mapped_column(Date, default=lambda: date.today() + timedelta(days=14))
+    due_date: Mapped[date] = mapped_column(Date, default=lambda: date.today() + LOAN_PERIOD)
     returned_date: Mapped[Optional[date]] = mapped_column(Date)
     fine_amount: Mapped[Optional[float]]
 
     member: Mapped["Member"] = relationship(back_populates="loans")
+    # Never loaded implicitly; queries that need the book must load it explicitly
+    book: Mapped["Book"] = relationship(back_populates="loans", lazy="raise")
+
+    @hybrid_method
+    def fine_as_of(self, today: date) -> float:
+        """
+        Fine owed on this loan as of the given day: $0.50/day overdue while
+        active, or the recorded fine_amount once returned.
+        """
+        if self.returned_date is not None:
+            return self.fine_amount or 0.0
+        if self.due_date < today:
+            return (today - self.due_date).days * FINE_PER_DAY
+        return 0.0
+
+    @fine_as_of.expression
+    def fine_as_of(cls, today: date):
+        today = literal(today, Date)
+        return case(
+            (cls.returned_date.isnot(None), func.coalesce(cls.fine_amount, 0)),
+            (cls.due_date < today, _days_between(today, cls.due_date) * FINE_PER_DAY),
+            else_=0,
+        )
+
+
+# ========== SQL HELPERS ==========
+class _days_between(FunctionElement):
+    """Whole days from the second date to the first, compiled per dialect."""
+    name = "days_between"
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(_days_between)
+def _days_between_default(element, compiler, **kw):
+    later, earlier = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"({later} - {earlier})"
+
+
+@compiles(_days_between, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    later, earlier = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"CAST(julianday({later}) - julianday({earlier}) AS INTEGER)"
+
+
+@compiles(_days_between, "mysql")
+def _days_between_mysql(element, compiler, **kw):
+    later, earlier = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"DATEDIFF({later}, {earlier})"
+
+
+# ========== FULL-TEXT SEARCH (SQLite only) ==========
+# External-content FTS5 index over the searchable book columns, kept in sync by triggers.
+books_fts = table("books_fts", column("rowid"), column("books_fts"))
+
+BOOKS_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS books_fts
+       USING fts5(title, author, genre, content='books', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+         INSERT INTO books_fts(rowid, title, author, genre) VALUES (new.id, new.title, new.author, new.genre);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+         INSERT INTO books_fts(books_fts, rowid, title, author, genre)
+         VALUES ('delete', old.id, old.title, old.author, old.genre);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author, genre ON books BEGIN
+         INSERT INTO books_fts(books_fts, rowid, title, author, genre)
+         VALUES ('delete', old.id, old.title, old.author, old.genre);
+         INSERT INTO books_fts(rowid, title, author, genre) VALUES (new.id, new.title, new.author, new.genre);
+       END""",
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_books_fts(target, connection, **kw):
+    """
+    Creates the book search index after create_all(), indexing any existing books the first time.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'books_fts'").first()
+    for statement in BOOKS_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if exists is None:
+        connection.exec_driver_sql("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def drop_books_fts(target, connection, **kw):
+    """
+    Drops the book search index together with the tables on drop_all().
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS books_fts")
@@ -0,0 +1,16 @@
+"""
+Shared response helpers for the LibraryMCP routers.
+"""
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_list_response(adapter: TypeAdapter, rows: Iterable[Any]) -> Response:
+    """
+    Serializes ORM rows straight to a JSON response with a list TypeAdapter,
+    instead of FastAPI's per-item encoding of the return value.
+    """
+    content = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(content=content, media_type="application/json")
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from ..database import get_db
-from ..schemas import BookCreate, BookUpdate, BookResponse
+from ..responses import json_list_response
+from ..schemas import BOOK_LIST_ADAPTER, BookCreate, BookUpdate, BookResponse
 from .. import crud
 
 router = APIRouter(prefix="/books", tags=["Books"])
@@ -12,21 +13,31 @@ router = APIRouter(prefix="/books", tags=["Books"])
 
 @router.get("/", response_model=list[BookResponse])
 def list_books(
-        title: Optional[str] = Query(None, description="Filter by book title (partial match)"),
-        author: Optional[str] = Query(None, description="Filter by author name (partial match)"),
-        genre: Optional[str] = Query(None, description="Filter by genre (partial match)"),
+        skip: int = Query(0, ge=0, description="Number of records to skip"),
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+        title: Optional[str] = Query(None, description="Filter by book title (word prefix match on SQLite, substring match on other databases)"),
+        author: Optional[str] = Query(None, description="Filter by author name (word prefix match on SQLite, substring match on other databases)"),
+        genre: Optional[str] = Query(None, description="Filter by genre (word prefix match on SQLite, substring match on other databases)"),
         available_only: bool = Query(False, description="Show only books with available copies"),
         db: Session = Depends(get_db)
 ):
     """
-    List all books with optional filters.
+    List all books with pagination and optional filters.
 
+    - **skip**: Number of records to skip for pagination (int)
+    - **limit**: Maximum number of records to return, 1-1000 (int)
     - **title**: Filter books by title (Optional[str])
     - **author**: Filter books by author (Optional[str])
     - **genre**: Filter books by genre (Optional[str])
     - **available_only**: If True, only return books with available_copies > 0 (bool)
+
+    On SQLite the text filters use the FTS5 index and match word prefixes, so `title=198`
+    finds "1984" but `title=98` does not; other databases match case-insensitive substrings.
     """
-    return crud.get_books(db, title=title, author=author, genre=genre, available_only=available_only)
+    books = crud.get_books(
+        db, skip=skip, limit=limit, title=title, author=author, genre=genre, available_only=available_only
+    )
+    return json_list_response(BOOK_LIST_ADAPTER, books)
 
 
 @router.get("/{book_id}", response_model=BookResponse)
@@ -52,13 +63,12 @@ def create_book(book: BookCreate, db: Session = Depends(get_db)):
     Returns the created book with its assigned ID and available_copies set to total_copies.
     Raises 409 Error if a book with the same ISBN already exists.
     """
-    if crud.get_book_by_isbn(db, book.isbn):
-        raise HTTPException(status_code=409, detail=f"Book with ISBN {book.isbn} already exists")
+    # The unique constraint on isbn detects duplicates without a separate lookup
     try:
         return crud.create_book(db, book)
     except IntegrityError:
         db.rollback()
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Book already exists")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Book with ISBN {book.isbn} already exists")
 
 
 @router.put("/{book_id}", response_model=BookResponse, status_code=status.HTTP_200_OK)
@@ -69,14 +79,14 @@ def update_book(book_id: int, book_update: BookUpdate, db: Session = Depends(get
     - **book_id**: The unique identifier of the book to update (int)
     - **book_update**: The fields to update (BookUpdate)
     """
-    book = crud.get_book(db, book_id)
-    if not book:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
     try:
-        return crud.update_book(db, book, book_update.model_dump(exclude_unset=True))
+        book = crud.update_book(db, book_id, book_update.model_dump(exclude_unset=True))
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Update failed due to a conflict")
+    if not book:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return book
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_200_OK)
@@ -90,7 +100,7 @@ def delete_book(book_id: int, db: Session = Depends(get_db)):
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Book with ID {book_id} not found")
 
-    if crud.count_active_loans_for_book(db, book_id) > 0:
+    if crud.has_active_loan_for_book(db, book_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot delete book with active loans")
 
     try:
@@ -1,19 +1,23 @@
 """
 Router for loan-related operations (borrowing, returning, and fines).
 """
+from datetime import date
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
-from ..schemas import LoanCreate, LoanResponse
+from ..dependencies import get_today
+from ..responses import json_list_response
+from ..schemas import LOAN_LIST_ADAPTER, LoanCreate, LoanResponse
 from .. import crud
 
 router = APIRouter(prefix="/loans", tags=["Loans"])
 
 
 @router.post("/borrow", response_model=LoanResponse, status_code=status.HTTP_201_CREATED)
-def borrow_book(loan: LoanCreate, db: Session = Depends(get_db)):
+def borrow_book(loan: LoanCreate, db: Session = Depends(get_db), today: date = Depends(get_today)):
     """
     Borrow a book (creates a loan record).
 
@@ -25,26 +29,30 @@ def borrow_book(loan: LoanCreate, db: Session = Depends(get_db)):
     - Member must exist and be active
     - Member cannot borrow the same book twice simultaneously
     """
-    member = crud.get_member(db, loan.member_id)
-    if not member:
+    borrow_status = crud.get_borrow_status(db, loan.member_id, loan.book_id)
+    if not borrow_status:
         raise HTTPException(status_code=404, detail="Member not found")
-    if not member.is_active:
+    if not borrow_status.is_active:
         raise HTTPException(status_code=400, detail="Member account is not active")
 
-    book = crud.get_book(db, loan.book_id)
-    if not book:
+    if borrow_status.title is None:
         raise HTTPException(status_code=404, detail="Book not found")
-    if book.available_copies <= 0:
-        raise HTTPException(status_code=409, detail=f"Book '{book.title}' has no available copies")
+    no_copies = HTTPException(status_code=409, detail=f"Book '{borrow_status.title}' has no available copies")
+    if borrow_status.available_copies <= 0:
+        raise no_copies
 
-    if crud.get_active_loan(db, loan.member_id, loan.book_id):
+    if borrow_status.has_active_loan:
         raise HTTPException(status_code=409, detail="Member already has an active loan for this book")
 
-    return crud.create_loan(db, book=book, member_id=loan.member_id)
+    # The conditional decrement still guards against a concurrent borrow taking the last copy
+    new_loan = crud.create_loan(db, book_id=loan.book_id, member_id=loan.member_id, today=today)
+    if new_loan is None:
+        raise no_copies
+    return new_loan
 
 
 @router.post("/return", response_model=LoanResponse)
-def return_book(loan: LoanCreate, db: Session = Depends(get_db)):
+def return_book(loan: LoanCreate, db: Session = Depends(get_db), today: date = Depends(get_today)):
     """
     Return a borrowed book.
 
@@ -60,8 +68,10 @@ def return_book(loan: LoanCreate, db: Session = Depends(get_db)):
     if not active_loan:
         raise HTTPException(status_code=400, detail="No active loan found for this book and member")
 
-    book = crud.get_book(db, loan.book_id)
-    return crud.close_loan(db, active_loan, book)
+    closed_loan = crud.close_loan(db, active_loan, today=today)
+    if closed_loan is None:
+        raise HTTPException(status_code=400, detail="No active loan found for this book and member")
+    return closed_loan
 
 
 @router.get("/{member_id}", response_model=List[LoanResponse])
@@ -75,11 +85,12 @@ def get_loans(member_id: int, db: Session = Depends(get_db)):
     """
     if not crud.get_member(db, member_id):
         raise HTTPException(status_code=404, detail="Member not found")
-    return crud.get_active_loans_for_member(db, member_id)
+    loans = crud.get_active_loans_for_member(db, member_id)
+    return json_list_response(LOAN_LIST_ADAPTER, loans)
 
 
 @router.get("/{member_id}/fines", response_model=dict)
-def check_fines(member_id: int, db: Session = Depends(get_db)):
+def check_fines(member_id: int, db: Session = Depends(get_db), today: date = Depends(get_today)):
     """
     Calculate overdue fines for a member.
 
@@ -98,8 +109,7 @@ def check_fines(member_id: int, db: Session = Depends(get_db)):
     if not crud.get_member(db, member_id):
         raise HTTPException(status_code=404, detail="Member not found")
 
-    all_loans = crud.get_member_loans(db, member_id)
-    fine_details = crud.calculate_detailed_member_fines(all_loans)
+    fine_details = crud.calculate_detailed_member_fines(db, member_id, today=today)
 
     return {
         "member_id": member_id,
@@ -1,25 +1,39 @@
 """
 Router for member-related operations (registration, retrieval, updates, and deletion).
 """
+from datetime import date
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, List
+from typing import Literal, Optional, List, Union
 
 from ..database import get_db
-from ..schemas import MemberCreate, MemberResponse, MemberUpdate, LoanResponse
+from ..dependencies import get_today
+from ..responses import json_list_response
+from ..schemas import (
+    LOAN_LIST_ADAPTER,
+    MEMBER_LIST_ADAPTER,
+    MEMBER_WITH_LOANS_LIST_ADAPTER,
+    MemberCreate,
+    MemberListItem,
+    MemberResponse,
+    MemberUpdate,
+    MemberWithLoans,
+)
 from .. import crud
 
 router = APIRouter(prefix="/members", tags=["Members"])
 
 
-@router.get("/", response_model=List[MemberResponse])
+@router.get("/", response_model=Union[List[MemberListItem], List[MemberWithLoans]])
 def list_members(
         skip: int = Query(0, ge=0, description="Number of records to skip"),
         limit: int = Query(100, ge=1, le=500, description="Maximum number of records to return"),
         name: Optional[str] = Query(None, description="Filter by name (partial match)"),
         email: Optional[str] = Query(None, description="Filter by email (partial match)"),
         is_active: Optional[bool] = Query(None, description="Filter by active status"),
+        expand: List[Literal["loans"]] = Query([], description="Related data to include in each member"),
         db: Session = Depends(get_db)
 ):
     """List all members with optional filters
@@ -29,11 +43,16 @@ def list_members(
     - **name**: Filter by member name (case-insensitive partial match)
     - **email**: Filter by email address (case-insensitive partial match)
     - **is_active**: Filter by active status (true/false)
+    - **expand**: Pass `loans` to include each member's loan history
 
-    Note: This endpoint returns basic member info without loan history for performance.
+    Note: By default this endpoint returns basic member info without loan history for performance.
     Use GET /members/{id} to get detailed information with loans and fines.
     """
-    return crud.get_members(db, skip=skip, limit=limit, name=name, email=email, is_active=is_active)
+    members = crud.get_members(
+        db, skip=skip, limit=limit, name=name, email=email, is_active=is_active, expand=set(expand)
+    )
+    adapter = MEMBER_WITH_LOANS_LIST_ADAPTER if "loans" in expand else MEMBER_LIST_ADAPTER
+    return json_list_response(adapter, members)
 
 
 @router.post("/", response_model=MemberResponse, status_code=status.HTTP_201_CREATED)
@@ -45,17 +64,19 @@ def register_member(member: MemberCreate, db: Session = Depends(get_db)):
     - **joined_date**: The date the member joined. Defaults to today's date.
     - **is_active**: Whether the member is active. Defaults to True.
     """
-    if crud.get_member_by_email(db, member.email):
-        raise HTTPException(status_code=409, detail="A member with that email already exists")
+    # The unique constraint on email detects duplicates without a separate lookup
     try:
-        return crud.create_member(db, member)
+        new_member = crud.create_member(db, member)
     except IntegrityError:
         db.rollback()
+        new_member = None
+    if new_member is None:
         raise HTTPException(status_code=409, detail="A member with that email already exists")
+    return new_member
 
 
 @router.get("/{member_id}", response_model=MemberResponse)
-def get_member(member_id: int, db: Session = Depends(get_db)):
+def get_member(member_id: int, db: Session = Depends(get_db), today: date = Depends(get_today)):
     """Returns a member by ID with complete loan history and fines
 
     - **member_id**: The unique identifier of the member to retrieve.
@@ -66,14 +87,15 @@ def get_member(member_id: int, db: Session = Depends(get_db)):
     - Active loans count
     - Total outstanding fines
     """
-    member = crud.get_member(db, member_id)
+    member = crud.get_member_with_loans(db, member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
 
-    loans = crud.get_member_loans(db, member_id)
-    loan_responses = [LoanResponse.model_validate(loan) for loan in loans]
-    active_loans_count = crud.count_active_loans_for_member(db, member_id)
-    total_fines = crud.calculate_member_fines(loans)
+    # Count and fines come from the loans loaded with the member, not extra queries
+    loans = member.loans
+    loan_responses = LOAN_LIST_ADAPTER.validate_python(loans, from_attributes=True)
+    active_loans_count = sum(1 for loan in loans if loan.returned_date is None)
+    total_fines = crud.calculate_loan_fines(loans, today=today)
 
     return MemberResponse(
         id=member.id,
@@ -82,8 +104,8 @@ def get_member(member_id: int, db: Session = Depends(get_db)):
         joined_date=member.joined_date,
         is_active=member.is_active,
         loans=loan_responses,
-        active_loans_count=active_loans_count or 0,
-        total_fines=round(total_fines, 2)
+        active_loans_count=active_loans_count,
+        total_fines=total_fines
     )
 
 
@@ -104,31 +126,28 @@ def update_member(
     - Cannot deactivate member with active loans
     - Email must be unique if changed
     """
-    member = crud.get_member(db, member_id)
-    if not member:
-        raise HTTPException(status_code=404, detail="Member not found")
-
-    if member_update.is_active is False and member.is_active:
-        active_loans_count = crud.count_active_loans_for_member(db, member_id)
-        if active_loans_count > 0:
+    if member_update.is_active is False:
+        # Only count the loans for the error message once some are known to exist
+        if crud.has_active_loan_for_member(db, member_id):
+            active_loans_count = crud.count_active_loans_for_member(db, member_id)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot deactivate member with {active_loans_count} active loan(s). Please return all books first."
             )
 
-    if member_update.email and member_update.email != member.email:
-        if crud.get_member_by_email(db, member_update.email):
-            raise HTTPException(status_code=409, detail="A member with that email already exists")
-
     try:
-        return crud.update_member(db, member, member_update.model_dump(exclude_unset=True))
+        member = crud.update_member(db, member_id, member_update.model_dump(exclude_unset=True))
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=409, detail="A member with that email already exists")
+    # The UPDATE ... RETURNING matches no row for an unknown member
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    return member
 
 
 @router.delete("/{member_id}", status_code=status.HTTP_200_OK)
-def delete_member(member_id: int, db: Session = Depends(get_db)):
+def delete_member(member_id: int, db: Session = Depends(get_db), today: date = Depends(get_today)):
     """Deletes a member by ID
 
     - **member_id**: The unique identifier of the member to delete.
@@ -141,15 +160,13 @@ def delete_member(member_id: int, db: Session = Depends(get_db)):
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
 
-    active_loans_count = crud.count_active_loans_for_member(db, member_id)
+    active_loans_count, total_fines = crud.summarize_member_loans(db, member_id, today=today)
     if active_loans_count > 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot delete member with {active_loans_count} active loan(s). Please return all books first."
         )
 
-    all_loans = crud.get_member_loans(db, member_id)
-    total_fines = crud.calculate_member_fines(all_loans)
     if total_fines > 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2,12 +2,10 @@
 Pydantic schemas for the LibraryMCP application.
 This module defines the request and response models for Books, Members, and Loans.
 """
-import re
 from datetime import date
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
-
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 
 # ========== BOOK SCHEMAS ==========
 class BookBase(BaseModel):
@@ -56,16 +54,7 @@ class MemberBase(BaseModel):
     Base schema for Member models.
     """
     name: str = Field(..., examples=["Bob Smith"])
-    email: str = Field(..., examples=["bob@example.com"])
-
-    @field_validator('email')
-    @classmethod
-    def validate_email(cls, v: str) -> str:
-        # Basic email validation regex
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, v):
-            raise ValueError('Invalid email address')
-        return v
+    email: EmailStr = Field(..., examples=["bob@example.com"])
 
 
 class MemberCreate(MemberBase):
@@ -75,6 +64,24 @@ class MemberCreate(MemberBase):
     pass
 
 
+class MemberListItem(MemberBase):
+    """
+    Schema for Member list responses, without loan details.
+    """
+    id: int
+    joined_date: date
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MemberWithLoans(MemberListItem):
+    """
+    Schema for Member list responses expanded with loan history.
+    """
+    loans: List["LoanResponse"] = Field(description="Loan history (included with expand=loans)")
+
+
 class MemberResponse(MemberBase):
     """
     Schema for Member responses.
@@ -95,20 +102,9 @@ class MemberUpdate(BaseModel):
     Schema for updating an existing Member.
     """
     name: Optional[str] = None
-    email: Optional[str] = None
+    email: Optional[EmailStr] = None
     is_active: Optional[bool] = None
 
-    @field_validator('email')
-    @classmethod
-    def validate_email(cls, v: Optional[str]) -> Optional[str]:
-        if v is None:
-            return v
-        # Basic email validation regex
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, v):
-            raise ValueError('Invalid email address')
-        return v
-
 
 # ========== LOAN SCHEMAS ==========
 class LoanBase(BaseModel):
@@ -137,3 +133,16 @@ class LoanResponse(LoanBase):
     fine_amount: Optional[float] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Resolve the forward references to LoanResponse once at import, not on first use
+MemberWithLoans.model_rebuild()
+MemberResponse.model_rebuild()
+
+
+# ========== LIST ADAPTERS ==========
+# Shared by the list endpoints to validate and serialize a whole page in one pydantic-core call
+BOOK_LIST_ADAPTER = TypeAdapter(List[BookResponse])
+MEMBER_LIST_ADAPTER = TypeAdapter(List[MemberListItem])
+MEMBER_WITH_LOANS_LIST_ADAPTER = TypeAdapter(List[MemberWithLoans])
+LOAN_LIST_ADAPTER = TypeAdapter(List[LoanResponse])
@@ -4,140 +4,86 @@ Includes books, library members, and some active loans.
 """
 from datetime import date, timedelta
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, inspect, select
 
 from backend.database import SessionLocal, engine
 from backend.models import Base, Book, Loan, Member
 
 
+# (title, author, isbn, total_copies, available_copies, genre)
+BOOK_SPECS = (
+    ("The Great Gatsby", "F. Scott Fitzgerald", "978-0-7432-7356-5", 3, 3, "Fiction"),
+    ("To Kill a Mockingbird", "Harper Lee", "978-0-06-112008-4", 2, 2, "Fiction"),
+    ("1984", "George Orwell", "978-0-452-28423-4", 4, 3, "Dystopian"),
+    ("Pride and Prejudice", "Jane Austen", "978-0-14-143951-8", 2, 2, "Romance"),
+    ("The Catcher in the Rye", "J.D. Salinger", "978-0-316-76948-0", 3, 2, "Fiction"),
+)
+
+# (name, email, days since joining)
+MEMBER_SPECS = (
+    ("Alice Johnson", "alice.johnson@example.com", 180),
+    ("Bob Smith", "bob.smith@example.com", 90),
+    ("Carol Williams", "carol.williams@example.com", 60),
+    ("David Brown", "david.brown@example.com", 30),
+)
+
+# (book isbn, member email, days since borrowing, days until due)
+LOAN_SPECS = (
+    ("978-0-452-28423-4", "alice.johnson@example.com", 5, 9),  # 1984
+    ("978-0-316-76948-0", "bob.smith@example.com", 3, 11),  # The Catcher in the Rye
+)
+
+
 def seed_database() -> None:
     """
     Seed the database with initial data.
     Creates tables if they don't exist and adds sample books, members, and loans.
     """
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # Create all tables, unless a previous run (or the API's startup) already did
+    if not inspect(engine).has_table(Loan.__tablename__):
+        Base.metadata.create_all(bind=engine)
 
-    db: Session = SessionLocal()
-
-    try:
+    # Commits once on success, rolls back and re-raises on error, and always closes the session
+    with SessionLocal() as db, db.begin():
         # Check if data already exists
-        if db.query(Book).count() > 0:
+        if db.execute(select(Book.id).limit(1)).scalar() is not None:
             print("Database already seeded. Skipping...")
             return
 
+        # One reference date keeps every row consistent, even across midnight
+        today = date.today()
+
         # Seed Books
         books = [
-            Book(
-                title="The Great Gatsby",
-                author="F. Scott Fitzgerald",
-                isbn="978-0-7432-7356-5",
-                total_copies=3,
-                available_copies=3,
-                genre="Fiction"
-            ),
-            Book(
-                title="To Kill a Mockingbird",
-                author="Harper Lee",
-                isbn="978-0-06-112008-4",
-                total_copies=2,
-                available_copies=2,
-                genre="Fiction"
-            ),
-            Book(
-                title="1984",
-                author="George Orwell",
-                isbn="978-0-452-28423-4",
-                total_copies=4,
-                available_copies=3,
-                genre="Dystopian"
-            ),
-            Book(
-                title="Pride and Prejudice",
-                author="Jane Austen",
-                isbn="978-0-14-143951-8",
-                total_copies=2,
-                available_copies=2,
-                genre="Romance"
-            ),
-            Book(
-                title="The Catcher in the Rye",
-                author="J.D. Salinger",
-                isbn="978-0-316-76948-0",
-                total_copies=3,
-                available_copies=2,
-                genre="Fiction"
-            ),
+            {"title": title, "author": author, "isbn": isbn, "total_copies": total_copies,
+             "available_copies": available_copies, "genre": genre}
+            for title, author, isbn, total_copies, available_copies, genre in BOOK_SPECS
         ]
 
-        db.add_all(books)
-        db.commit()
+        book_ids = dict(db.execute(insert(Book).returning(Book.isbn, Book.id), books).all())
         print(f"Seeded {len(books)} books")
 
         # Seed Members
         members = [
-            Member(
-                name="Alice Johnson",
-                email="alice.johnson@example.com",
-                joined_date=date.today() - timedelta(days=180),
-                is_active=True
-            ),
-            Member(
-                name="Bob Smith",
-                email="bob.smith@example.com",
-                joined_date=date.today() - timedelta(days=90),
-                is_active=True
-            ),
-            Member(
-                name="Carol Williams",
-                email="carol.williams@example.com",
-                joined_date=date.today() - timedelta(days=60),
-                is_active=True
-            ),
-            Member(
-                name="David Brown",
-                email="david.brown@example.com",
-                joined_date=date.today() - timedelta(days=30),
-                is_active=True
-            ),
+            {"name": name, "email": email, "joined_date": today - timedelta(days=joined_days_ago), "is_active": True}
+            for name, email, joined_days_ago in MEMBER_SPECS
         ]
 
-        db.add_all(members)
-        db.commit()
+        member_ids = dict(db.execute(insert(Member).returning(Member.email, Member.id), members).all())
         print(f"Seeded {len(members)} members")
 
-        # Seed some active loans
+        # Seed some active loans, using the ids returned by the inserts above
         loans = [
-            Loan(
-                book_id=3,  # 1984
-                member_id=1,  # Alice
-                borrowed_date=date.today() - timedelta(days=5),
-                due_date=date.today() + timedelta(days=9),
-                returned_date=None,
-                fine_amount=None
-            ),
-            Loan(
-                book_id=5,  # The Catcher in the Rye
-                member_id=2,  # Bob
-                borrowed_date=date.today() - timedelta(days=3),
-                due_date=date.today() + timedelta(days=11),
-                returned_date=None,
-                fine_amount=None
-            ),
+            {"book_id": book_ids[isbn], "member_id": member_ids[email],
+             "borrowed_date": today - timedelta(days=borrowed_days_ago), "due_date": today + timedelta(days=due_in_days)}
+            for isbn, email, borrowed_days_ago, due_in_days in LOAN_SPECS
         ]
 
-        db.add_all(loans)
-        db.commit()
+        db.execute(insert(Loan), loans)
         print(f"Seeded {len(loans)} loans")
 
-        print("Database seeding completed successfully!")
-
-    except Exception as e:
-        print(f"Error seeding database: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    print("Database seeding completed successfully!")
 
 
 if __name__ == "__main__":
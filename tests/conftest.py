@@ -1,9 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from backend.auth import get_current_user
 from backend.database import Base, get_db
 from backend.main import app
 
@@ -16,7 +17,7 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 @pytest.fixture
@@ -39,37 +40,60 @@ def client(db):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: "admin"
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
 
-def make_book(client, **overrides):
-    payload = {
-        "title": "Test Book",
-        "author": "Test Author",
-        "isbn": "978-0000000000",
-        "total_copies": 3,
-        "genre": "Fiction",
-    }
-    payload.update(overrides)
-    response = client.post("/books/", json=payload)
-    assert response.status_code == 201, response.text
-    return response.json()
-
-
-def make_member(client, **overrides):
-    payload = {
-        "name": "Test Member",
-        "email": "test@example.com",
-    }
-    payload.update(overrides)
-    response = client.post("/members/", json=payload)
-    assert response.status_code == 201, response.text
-    return response.json()
-
-
-def make_loan(client, member_id, book_id):
-    response = client.post("/loans/borrow", json={"member_id": member_id, "book_id": book_id})
-    assert response.status_code == 201, response.text
-    return response.json()
+@pytest.fixture
+def sql_statements():
+    """Collects every SQL statement sent to the test engine."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def make_book(client):
+    def _make_book(**overrides):
+        payload = {
+            "title": "Test Book",
+            "author": "Test Author",
+            "isbn": "978-0000000000",
+            "total_copies": 3,
+            "genre": "Fiction",
+        }
+        payload.update(overrides)
+        response = client.post("/books/", json=payload)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return _make_book
+
+
+@pytest.fixture
+def make_member(client):
+    def _make_member(**overrides):
+        payload = {
+            "name": "Test Member",
+            "email": "test@example.com",
+        }
+        payload.update(overrides)
+        response = client.post("/members/", json=payload)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return _make_member
+
+
+@pytest.fixture
+def make_loan(client):
+    def _make_loan(member_id, book_id):
+        response = client.post("/loans/borrow", json={"member_id": member_id, "book_id": book_id})
+        assert response.status_code == 201, response.text
+        return response.json()
+    return _make_loan
@@ -0,0 +1,26 @@
+# ========== WRITE ROUND-TRIP TESTS ==========
+
+def test_create_book_is_one_statement(client, sql_statements):
+    """Adding a book is a single INSERT ... RETURNING, with no reload after commit."""
+    response = client.post("/books/", json={"title": "1984", "author": "George Orwell", "isbn": "978-0451524935"})
+    assert response.status_code == 201
+    assert response.json()["available_copies"] == 1
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("INSERT INTO books")
+
+
+def test_update_book_is_one_statement(client, db, make_book, sql_statements):
+    """Updating a book is a single UPDATE ... RETURNING, with no reload after commit."""
+    book = make_book()
+    db.expunge_all()
+    sql_statements.clear()
+    response = client.put(f"/books/{book['id']}", json={"title": "Animal Farm"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Animal Farm"
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("UPDATE books")
+
+
+def test_update_missing_book_returns_404(client):
+    """Updating an unknown book is a 404."""
+    assert client.put("/books/999", json={"title": "Animal Farm"}).status_code == 404
@@ -0,0 +1,282 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.exc import InvalidRequestError
+
+from backend import crud
+from backend.database import raise_on_lazy_load
+from backend.models import Book, Loan, Member
+from backend.schemas import BookCreate, MemberCreate
+
+
+def add_member_with_book(db):
+    book = Book(title="1984", author="George Orwell", isbn="978-0451524935", total_copies=5, available_copies=5)
+    member = Member(name="Bob Smith", email="bob@example.com")
+    db.add_all([book, member])
+    db.commit()
+    return member, book
+
+
+def add_loan(db, member, book, due_in_days, returned=False, fine_amount=None):
+    today = date.today()
+    loan = Loan(
+        book_id=book.id,
+        member_id=member.id,
+        borrowed_date=today - timedelta(days=14),
+        due_date=today + timedelta(days=due_in_days),
+        returned_date=today if returned else None,
+        fine_amount=fine_amount,
+    )
+    db.add(loan)
+    db.commit()
+    return loan
+
+
+# ========== FINE CALCULATION TESTS ==========
+
+def test_fines_zero_without_loans(db):
+    """A member without loans has no fines."""
+    member, _ = add_member_with_book(db)
+    assert crud.calculate_detailed_member_fines(db, member.id) == {
+        "total_fines": 0.0,
+        "active_overdue_loans": 0,
+        "unpaid_returned_fines": 0.0,
+    }
+
+
+def test_fines_ignore_active_loans_not_yet_due(db):
+    """Active loans that are not overdue do not accrue fines."""
+    member, book = add_member_with_book(db)
+    add_loan(db, member, book, due_in_days=3)
+    assert crud.calculate_member_fines(db, member.id) == 0.0
+
+
+def test_fines_for_overdue_active_loan(db):
+    """Overdue active loans accrue $0.50 per day."""
+    member, book = add_member_with_book(db)
+    add_loan(db, member, book, due_in_days=-4)
+    details = crud.calculate_detailed_member_fines(db, member.id)
+    assert details["total_fines"] == 2.0
+    assert details["active_overdue_loans"] == 1
+    assert details["unpaid_returned_fines"] == 0.0
+
+
+def test_fines_include_returned_loan_fines(db):
+    """Recorded fine_amount on returned loans is added to the total."""
+    member, book = add_member_with_book(db)
+    add_loan(db, member, book, due_in_days=-6, returned=True, fine_amount=1.5)
+    add_loan(db, member, book, due_in_days=-2, returned=True, fine_amount=None)
+    add_loan(db, member, book, due_in_days=-1)
+    details = crud.calculate_detailed_member_fines(db, member.id)
+    assert details["total_fines"] == 2.0
+    assert details["active_overdue_loans"] == 1
+    assert details["unpaid_returned_fines"] == 1.5
+
+
+def test_fines_use_given_today(db):
+    """Fines are computed relative to the date passed in, not the clock."""
+    member, book = add_member_with_book(db)
+    loan = add_loan(db, member, book, due_in_days=0)
+    assert crud.calculate_member_fines(db, member.id, today=loan.due_date + timedelta(days=6)) == 3.0
+
+
+def test_fines_scoped_to_member(db):
+    """Loans of other members are not counted."""
+    member, book = add_member_with_book(db)
+    other = Member(name="Alice", email="alice@example.com")
+    db.add(other)
+    db.commit()
+    add_loan(db, other, book, due_in_days=-10)
+    assert crud.calculate_member_fines(db, member.id) == 0.0
+
+
+def test_loan_fines_match_aggregate_query(db):
+    """Fines computed from loaded loans match the SQL aggregate."""
+    member, book = add_member_with_book(db)
+    add_loan(db, member, book, due_in_days=-4)
+    add_loan(db, member, book, due_in_days=3)
+    add_loan(db, member, book, due_in_days=-6, returned=True, fine_amount=1.5)
+    member = crud.get_member_with_loans(db, member.id)
+    assert crud.calculate_loan_fines(member.loans) == crud.calculate_member_fines(db, member.id) == 3.5
+
+
+def test_summarize_member_loans(db):
+    """The summary counts active loans and totals fines like the detailed calculation."""
+    member, book = add_member_with_book(db)
+    assert crud.summarize_member_loans(db, member.id) == (0, 0.0)
+    add_loan(db, member, book, due_in_days=-4)
+    add_loan(db, member, book, due_in_days=3)
+    add_loan(db, member, book, due_in_days=-6, returned=True, fine_amount=1.5)
+    assert crud.summarize_member_loans(db, member.id) == (2, 3.5)
+
+
+def test_all_member_fines_grouped_by_member(db):
+    """Batch fines match the per-member calculation for every member with loans."""
+    member, book = add_member_with_book(db)
+    other = Member(name="Alice", email="alice@example.com")
+    idle = Member(name="Carol", email="carol@example.com")
+    db.add_all([other, idle])
+    db.commit()
+    add_loan(db, member, book, due_in_days=-4)
+    add_loan(db, member, book, due_in_days=-6, returned=True, fine_amount=1.5)
+    add_loan(db, other, book, due_in_days=2)
+    assert crud.calculate_all_member_fines(db) == {member.id: 3.5, other.id: 0.0}
+
+
+# ========== BOOK SEARCH TESTS ==========
+
+def add_books(db):
+    db.add_all([
+        Book(title="The Great Gatsby", author="F. Scott Fitzgerald", isbn="1", total_copies=1,
+             available_copies=1, genre="Fiction"),
+        Book(title="Nineteen Eighty-Four", author="George Orwell", isbn="2", total_copies=1,
+             available_copies=0, genre="Dystopian Fiction"),
+    ])
+    db.commit()
+
+
+def test_get_books_matches_word_prefixes(db):
+    """Search terms match the start of words in the given column, case-insensitively."""
+    add_books(db)
+    assert [b.isbn for b in crud.get_books(db, title="gats")] == ["1"]
+    assert [b.isbn for b in crud.get_books(db, author="george orw")] == ["2"]
+    assert [b.isbn for b in crud.get_books(db, genre="fiction")] == ["1", "2"]
+    assert crud.get_books(db, title="orwell") == []
+
+
+def test_get_books_combines_search_with_filters(db):
+    """Search terms combine with each other and with available_only."""
+    add_books(db)
+    assert [b.isbn for b in crud.get_books(db, genre="fiction", available_only=True)] == ["1"]
+    assert [b.isbn for b in crud.get_books(db, title="great", author="orwell")] == []
+
+
+def test_get_books_search_follows_updates(db):
+    """The search index is kept in sync when a book is renamed."""
+    add_books(db)
+    book = crud.get_book_by_isbn(db, "2")
+    crud.update_book(db, book.id, {"title": "1984"})
+    assert [b.isbn for b in crud.get_books(db, title="1984")] == ["2"]
+    assert crud.get_books(db, title="nineteen") == []
+
+
+def test_create_books_bulk_skips_duplicate_isbns(db):
+    """Bulk-inserted books are searchable and existing ISBNs are left untouched."""
+    add_books(db)
+    crud.create_books_bulk(db, [
+        BookCreate(title="Brave New World", author="Aldous Huxley", isbn="3", total_copies=2),
+        BookCreate(title="Duplicate", author="Nobody", isbn="1", total_copies=9),
+    ])
+    books = crud.get_books(db)
+    assert [(b.isbn, b.title) for b in books] == [
+        ("1", "The Great Gatsby"), ("2", "Nineteen Eighty-Four"), ("3", "Brave New World"),
+    ]
+    assert books[2].available_copies == 2
+    assert [b.isbn for b in crud.get_books(db, title="brave")] == ["3"]
+
+
+# ========== MEMBER TESTS ==========
+
+def test_create_member_returns_none_for_duplicate_email(db):
+    """A duplicate email is skipped by the insert instead of raising."""
+    member = crud.create_member(db, MemberCreate(name="Bob Smith", email="bob@example.com"))
+    assert member.id is not None and member.loans == []
+    assert crud.create_member(db, MemberCreate(name="Robert", email="bob@example.com")) is None
+    assert crud.get_member_by_email(db, "bob@example.com").name == "Bob Smith"
+
+
+def test_update_member_returns_updated_row(db):
+    """Updates are applied in place; a missing member yields None."""
+    member, _ = add_member_with_book(db)
+    updated = crud.update_member(db, member.id, {"name": "Robert", "is_active": False})
+    assert (updated.name, updated.email, updated.is_active) == ("Robert", "bob@example.com", False)
+    assert crud.update_member(db, 999, {"name": "Nobody"}) is None
+
+
+# ========== LOAN TESTS ==========
+
+def test_borrow_status_in_one_row(db):
+    """Borrow status reports member, book and duplicate-loan state together."""
+    member, book = add_member_with_book(db)
+    status = crud.get_borrow_status(db, member.id, book.id)
+    assert (status.is_active, status.title, status.available_copies, status.has_active_loan) == (True, "1984", 5, False)
+    add_loan(db, member, book, due_in_days=14)
+    assert crud.get_borrow_status(db, member.id, book.id).has_active_loan
+    assert crud.get_borrow_status(db, member.id, 999).title is None
+    assert crud.get_borrow_status(db, 999, book.id) is None
+
+
+def test_create_loan_reserves_one_copy(db):
+    """Borrowing decrements available copies exactly once and sets the due date."""
+    member, book = add_member_with_book(db)
+    loan = crud.create_loan(db, book.id, member.id, today=date(2026, 1, 1))
+    assert (loan.borrowed_date, loan.due_date) == (date(2026, 1, 1), date(2026, 1, 15))
+    db.refresh(book)
+    assert book.available_copies == 4
+    assert db.query(Loan).count() == 1
+
+
+def test_create_loan_without_copies_creates_nothing(db):
+    """A book without available copies, or a missing book, yields no loan."""
+    member, book = add_member_with_book(db)
+    book.available_copies = 0
+    db.commit()
+    assert crud.create_loan(db, book.id, member.id) is None
+    assert crud.create_loan(db, 999, member.id) is None
+    db.refresh(book)
+    assert book.available_copies == 0
+    assert db.query(Loan).count() == 0
+
+
+def test_close_loan_sets_fine_from_today(db):
+    """The fine and return date come from the given day."""
+    member, book = add_member_with_book(db)
+    loan = crud.create_loan(db, book.id, member.id, today=date(2026, 1, 1))
+    closed = crud.close_loan(db, loan, today=date(2026, 1, 19))
+    assert (closed.returned_date, closed.fine_amount) == (date(2026, 1, 19), 2.0)
+
+
+def test_close_loan_twice_restores_one_copy(db):
+    """A second return of the same loan is rejected and leaves copies alone."""
+    member, book = add_member_with_book(db)
+    loan = crud.create_loan(db, book.id, member.id)
+    assert crud.close_loan(db, loan) is not None
+    assert crud.close_loan(db, loan) is None
+    db.refresh(book)
+    assert book.available_copies == 5
+
+
+# ========== DEV MODE TESTS ==========
+
+@pytest.fixture
+def dev_db(db):
+    event.listen(db, "do_orm_execute", raise_on_lazy_load)
+    yield db
+    event.remove(db, "do_orm_execute", raise_on_lazy_load)
+
+
+def test_dev_mode_raises_on_lazy_load_after_select(dev_db):
+    """In DEV mode a relationship not loaded by the SELECT raises."""
+    member, _ = add_member_with_book(dev_db)
+    dev_db.expunge_all()
+    with pytest.raises(InvalidRequestError):
+        crud.get_member(dev_db, member.id).loans
+
+
+def test_dev_mode_raises_on_lazy_load_after_returning(dev_db):
+    """Rows loaded by UPDATE ... RETURNING get the same raiseload as SELECTs."""
+    member, _ = add_member_with_book(dev_db)
+    dev_db.expunge_all()
+    updated = dev_db.scalar(update(Member).where(Member.id == member.id).values(name="Robert").returning(Member))
+    with pytest.raises(InvalidRequestError):
+        updated.loans
+
+
+def test_dev_mode_keeps_explicit_eager_loads(dev_db):
+    """Relationships loaded up front stay available in DEV mode."""
+    member, book = add_member_with_book(dev_db)
+    add_loan(dev_db, member, book, due_in_days=3)
+    dev_db.expunge_all()
+    assert len(crud.update_member(dev_db, member.id, {"name": "Robert"}).loans) == 1
+    assert len(crud.get_member_with_loans(dev_db, member.id).loans) == 1
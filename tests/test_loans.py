@@ -0,0 +1,91 @@
+def borrow(client, member_id, book_id):
+    return client.post("/loans/borrow", json={"member_id": member_id, "book_id": book_id})
+
+
+def return_book(client, member_id, book_id):
+    return client.post("/loans/return", json={"member_id": member_id, "book_id": book_id})
+
+
+# ========== BORROW AND RETURN TESTS ==========
+
+def test_borrow_round_trips(client, db, make_book, make_member, sql_statements):
+    """Borrowing is a status SELECT, the copy reservation and the loan INSERT ... RETURNING."""
+    book = make_book()
+    member = make_member()
+    db.expunge_all()
+    sql_statements.clear()
+    response = borrow(client, member["id"], book["id"])
+    assert response.status_code == 201
+    assert response.json()["returned_date"] is None
+    assert [statement.split()[0] for statement in sql_statements] == ["SELECT", "UPDATE", "INSERT"]
+
+
+def test_return_round_trips(client, db, make_book, make_member, make_loan, sql_statements):
+    """Returning is the loan lookup, its UPDATE ... RETURNING and the copy release."""
+    book = make_book()
+    member = make_member()
+    make_loan(member["id"], book["id"])
+    db.expunge_all()
+    sql_statements.clear()
+    response = return_book(client, member["id"], book["id"])
+    assert response.status_code == 200
+    assert response.json()["fine_amount"] == 0.0
+    assert [statement.split()[0] for statement in sql_statements] == ["SELECT", "UPDATE", "UPDATE"]
+    assert client.get(f"/books/{book['id']}").json()["available_copies"] == 3
+
+
+# ========== BORROW ERROR TESTS ==========
+
+def test_borrow_unknown_member_returns_404(client, make_book):
+    """Borrowing for a missing member is a 404."""
+    book = make_book()
+    response = borrow(client, 999, book["id"])
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Member not found"
+
+
+def test_borrow_inactive_member_returns_400(client, make_book, make_member):
+    """Inactive members cannot borrow."""
+    book = make_book()
+    member = make_member()
+    assert client.put(f"/members/{member['id']}", json={"is_active": False}).status_code == 200
+    assert borrow(client, member["id"], book["id"]).status_code == 400
+
+
+def test_borrow_unknown_book_returns_404(client, make_member):
+    """Borrowing a missing book is a 404."""
+    member = make_member()
+    response = borrow(client, member["id"], 999)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Book not found"
+
+
+def test_borrow_same_book_twice_returns_409(client, make_book, make_member, make_loan):
+    """A member cannot hold two loans of the same book."""
+    book = make_book()
+    member = make_member()
+    make_loan(member["id"], book["id"])
+    response = borrow(client, member["id"], book["id"])
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Member already has an active loan for this book"
+
+
+def test_borrow_without_copies_returns_409(client, make_book, make_member, make_loan):
+    """A book with no available copies cannot be borrowed."""
+    book = make_book(total_copies=1)
+    first = make_member()
+    second = make_member(email="other@example.com")
+    make_loan(first["id"], book["id"])
+    response = borrow(client, second["id"], book["id"])
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Book 'Test Book' has no available copies"
+
+
+def test_borrow_last_copy_twice_reports_no_copies(client, make_book, make_member, make_loan):
+    """A member holding the last copy is told the book has no copies left."""
+    book = make_book(total_copies=1)
+    member = make_member()
+    make_loan(member["id"], book["id"])
+    response = borrow(client, member["id"], book["id"])
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Book 'Test Book' has no available copies"
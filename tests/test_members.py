@@ -0,0 +1,88 @@
+# ========== CREATE MEMBER TESTS ==========
+
+def test_create_member_is_one_statement(client, sql_statements):
+    """Registering a member is a single INSERT ... RETURNING, with no reload after commit."""
+    response = client.post("/members/", json={"name": "Bob Smith", "email": "bob@example.com"})
+    assert response.status_code == 201
+    assert response.json()["email"] == "bob@example.com"
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("INSERT INTO members")
+
+
+def test_create_member_duplicate_email_returns_409(client, make_member):
+    """A second member with the same email is rejected."""
+    make_member(email="bob@example.com")
+    response = client.post("/members/", json={"name": "Robert", "email": "bob@example.com"})
+    assert response.status_code == 409
+
+
+# ========== UPDATE MEMBER TESTS ==========
+
+def test_update_member_loads_loans_with_the_update(client, db, make_book, make_member, make_loan, sql_statements):
+    """Updating a member is an UPDATE ... RETURNING plus one SELECT for its loans."""
+    member = make_member()
+    make_loan(member["id"], make_book()["id"])
+    db.expunge_all()
+    sql_statements.clear()
+    response = client.put(f"/members/{member['id']}", json={"name": "Robert"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Robert"
+    assert len(response.json()["loans"]) == 1
+    assert len(sql_statements) == 2
+    assert sql_statements[0].startswith("UPDATE members")
+
+
+def test_update_missing_member_returns_404(client):
+    """Updating an unknown member is a 404, including a deactivation."""
+    assert client.put("/members/999", json={"name": "Nobody"}).status_code == 404
+    assert client.put("/members/999", json={"is_active": False}).status_code == 404
+
+
+def test_deactivate_member_with_active_loan_returns_400(client, make_book, make_member, make_loan):
+    """Members with active loans cannot be deactivated."""
+    member = make_member()
+    make_loan(member["id"], make_book()["id"])
+    response = client.put(f"/members/{member['id']}", json={"is_active": False})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Cannot deactivate member with 1 active loan(s)")
+
+
+# ========== LIST MEMBERS TESTS ==========
+
+def test_list_members_expand_loans(client, make_book, make_member, make_loan):
+    """expand=loans adds each member's loan history to the listing."""
+    member = make_member()
+    make_member(email="other@example.com")
+    book = make_book()
+    make_loan(member["id"], book["id"])
+    response = client.get("/members/", params={"expand": "loans"})
+    assert response.status_code == 200
+    loans_by_email = {row["email"]: row["loans"] for row in response.json()}
+    assert [loan["book_id"] for loan in loans_by_email["test@example.com"]] == [book["id"]]
+    assert loans_by_email["other@example.com"] == []
+
+
+def test_list_members_without_expand_omits_loans(client, make_book, make_member, make_loan):
+    """The plain listing leaves loans out."""
+    member = make_member()
+    make_loan(member["id"], make_book()["id"])
+    rows = client.get("/members/").json()
+    assert len(rows) == 1
+    assert "loans" not in rows[0]
+
+
+def test_list_members_unknown_expand_returns_422(client):
+    """Only loans can be expanded."""
+    assert client.get("/members/", params={"expand": "foo"}).status_code == 422
+
+
+def test_list_members_returns_slim_rows_in_one_query(client, db, make_book, make_member, make_loan, sql_statements):
+    """Listed members carry only their profile columns and are fetched with one SELECT."""
+    member = make_member()
+    make_member(email="other@example.com")
+    make_loan(member["id"], make_book()["id"])
+    db.expunge_all()
+    sql_statements.clear()
+    rows = client.get("/members/").json()
+    assert [set(row) for row in rows] == [{"id", "name", "email", "joined_date", "is_active"}] * 2
+    assert len(sql_statements) == 1